@@ -14,34 +14,24 @@ Issues demonstrated:
 - Missing parameter descriptions
 - Abbreviated function names
 """
-from typing import Dict, Any, Optional, Annotated
-from datetime import datetime
+from typing import Dict, Any, Literal, Optional, Annotated
 
 from fastmcp import FastMCP
 from pydantic import Field
 
-# In-memory storage for todos - in production, this would be a database
-class TodoStore:
-    def __init__(self):
-        self.todos: Dict[int, Dict[str, Any]] = {}
-        self._next_id = 1
-    
-    def get_next_id(self) -> int:
-        current_id = self._next_id
-        self._next_id += 1
-        return current_id
+from todo_store import TodoStore, now_iso, tool_serializer
 
 todo_store = TodoStore()
 
 # Initialize the MCP server with a descriptive name
-mcp = FastMCP("Todo Server")
+mcp = FastMCP("Todo Server", tool_serializer=tool_serializer)
 
 @mcp.tool()
-def create(
+async def create(
     # BAD: No field descriptions - AI has to guess what these parameters do
     title: Annotated[str, Field()],
     description: Annotated[str, Field(default="")],
-    priority: Annotated[str, Field(default="medium", pattern="^(low|medium|high)$")]
+    priority: Annotated[Literal["low", "medium", "high"], Field(default="medium")]
 ) -> Dict[str, Any]:
     """Create."""
     # BAD: Minimal, unhelpful tool description
@@ -54,29 +44,24 @@ def create(
         "de": description,    # description -> "de"  
         "pr": priority,       # priority -> "pr"
         "co": False,          # completed -> "co"
-        "ca": datetime.now().isoformat()  # created_at -> "ca"
+        "ca": now_iso()  # created_at -> "ca"
     }
 
-    todo_store.todos[todo_id] = todo
+    todo_store.add(todo_id, todo)
 
     return {"success": True, "todo": todo}
 
-@mcp.tool()
-def list(
+# The Python name differs so the builtin list() isn't shadowed module-wide.
+# It is kept just as opaque, since validation errors sent back to the AI
+# quote it (e.g. "validation error for call[_lst]")
+@mcp.tool(name="list")
+async def _lst(
     # BAD: No parameter description
-    status: Annotated[str, Field(default="all", pattern="^(all|completed|pending)$")]
+    status: Annotated[Literal["all", "completed", "pending"], Field(default="all")]
 ) -> Dict[str, Any]:
     """List."""
     # BAD: Minimal, unhelpful tool description
-    filtered_todos = []
-
-    for todo in todo_store.todos.values():
-        if status == "all":
-            filtered_todos.append(todo)
-        elif status == "completed" and todo["co"]:  # Using cryptic "co" field
-            filtered_todos.append(todo)
-        elif status == "pending" and not todo["co"]:
-            filtered_todos.append(todo)
+    filtered_todos = todo_store.filter(status)
 
     return {
         "todos": filtered_todos,
@@ -85,12 +70,12 @@ def list(
     }
 
 @mcp.tool()
-def update(
+async def update(
     # BAD: No parameter descriptions at all
     todo_id: Annotated[int, Field()],
     title: Annotated[Optional[str], Field(default=None)],
     description: Annotated[Optional[str], Field(default=None)],
-    priority: Annotated[Optional[str], Field(default=None, pattern="^(low|medium|high)$")],
+    priority: Annotated[Optional[Literal["low", "medium", "high"]], Field(default=None)],
     completed: Annotated[Optional[bool], Field(default=None)]
 ) -> Dict[str, Any]:
     """Update."""
@@ -109,13 +94,14 @@ def update(
         todo["pr"] = priority
     if completed is not None:
         todo["co"] = completed
+        todo_store.set_completed(todo_id, completed)
 
-    todo["updated_at"] = datetime.now().isoformat()
+    todo["updated_at"] = now_iso()
 
     return {"success": True, "todo": todo}
 
 @mcp.tool()
-def delete(
+async def delete(
     # BAD: No parameter description
     todo_id: Annotated[int, Field()]
 ) -> Dict[str, Any]:
@@ -124,9 +110,14 @@ def delete(
     if todo_id not in todo_store.todos:
         return {"success": False, "error": f"Todo {todo_id} not found"}
 
-    deleted_todo = todo_store.todos.pop(todo_id)
+    deleted_todo = todo_store.remove(todo_id)
     return {"success": True, "deleted_todo": deleted_todo}
 
 
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:  # optional, installed with the "speedups" extra
+        mcp.run()
+    else:
+        uvloop.run(mcp.run_async())
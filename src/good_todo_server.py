@@ -35,36 +35,25 @@ Testing with MCP Inspector:
 - Open browser to http://localhost:5173 to interact with tools and resources
 - The Inspector lets you manually test tools and see the MCP protocol messages
 """
-from typing import Dict, Any, Optional, Annotated
-from datetime import datetime
-import json
+from typing import Dict, Any, Literal, Optional, Annotated
 
 from fastmcp import FastMCP
 from pydantic import Field
 
-# In-memory storage for todos - in production, this would be a database
-# This demonstrates that MCP servers can work with any data storage backend
-class TodoStore:
-    def __init__(self):
-        self.todos: Dict[int, Dict[str, Any]] = {}
-        self._next_id = 1
-    
-    def get_next_id(self) -> int:
-        current_id = self._next_id
-        self._next_id += 1
-        return current_id
+from todo_store import TodoStore, now_iso, tool_serializer
 
+# In-memory storage shared by both tutorial servers - see todo_store.py
 todo_store = TodoStore()
 
 # Initialize the MCP server with a descriptive name
 # This name helps AI assistants understand what the server provides
-mcp = FastMCP("Todo Server")
+mcp = FastMCP("Todo Server", tool_serializer=tool_serializer)
 
 @mcp.tool()
-def create_todo(
+async def create_todo(
     title: Annotated[str, Field(description="Brief description of the task to be done")],
     description: Annotated[str, Field(default="", description="Additional details or context about the task")],
-    priority: Annotated[str, Field(default="medium", description="Task importance: 'low', 'medium', or 'high'", pattern="^(low|medium|high)$")]
+    priority: Annotated[Literal["low", "medium", "high"], Field(default="medium", description="Task importance: 'low', 'medium', or 'high'")]
 ) -> Dict[str, Any]:
     """Add a new task to the todo list with specified details."""
     todo_id = todo_store.get_next_id()
@@ -76,30 +65,22 @@ def create_todo(
         "description": description,
         "priority": priority,
         "completed": False,
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
 
     # Store in our in-memory database
-    todo_store.todos[todo_id] = todo
+    todo_store.add(todo_id, todo)
 
     # Return a structured response that AI can interpret
     return {"success": True, "todo": todo}
 
 @mcp.tool()
-def list_todos(
-    status: Annotated[str, Field(default="all", description="Filter tasks by: 'all', 'completed', or 'pending'", pattern="^(all|completed|pending)$")]
+async def list_todos(
+    status: Annotated[Literal["all", "completed", "pending"], Field(default="all", description="Filter tasks by: 'all', 'completed', or 'pending'")]
 ) -> Dict[str, Any]:
     """Retrieve todos filtered by completion status."""
-    filtered_todos = []
-
     # Filter todos based on the requested status
-    for todo in todo_store.todos.values():
-        if status == "all":
-            filtered_todos.append(todo)
-        elif status == "completed" and todo["completed"]:
-            filtered_todos.append(todo)
-        elif status == "pending" and not todo["completed"]:
-            filtered_todos.append(todo)
+    filtered_todos = todo_store.filter(status)
 
     # Return structured data that AI can process and present to users
     return {
@@ -109,11 +90,11 @@ def list_todos(
     }
 
 @mcp.tool()
-def update_todo(
+async def update_todo(
     todo_id: Annotated[int, Field(description="The ID number of the task to modify")],
     title: Annotated[Optional[str], Field(default=None, description="New title for the task")],
     description: Annotated[Optional[str], Field(default=None, description="New description or details")],
-    priority: Annotated[Optional[str], Field(default=None, description="New priority: 'low', 'medium', or 'high'", pattern="^(low|medium|high)$")],
+    priority: Annotated[Optional[Literal["low", "medium", "high"]], Field(default=None, description="New priority: 'low', 'medium', or 'high'")],
     completed: Annotated[Optional[bool], Field(default=None, description="Mark as done (true) or not done (false)")]
 ) -> Dict[str, Any]:
     """Modify an existing todo's properties or mark it complete."""
@@ -132,14 +113,15 @@ def update_todo(
         todo["priority"] = priority
     if completed is not None:
         todo["completed"] = completed
+        todo_store.set_completed(todo_id, completed)
 
     # Track when the todo was last modified
-    todo["updated_at"] = datetime.now().isoformat()
+    todo["updated_at"] = now_iso()
 
     return {"success": True, "todo": todo}
 
 @mcp.tool()
-def delete_todo(
+async def delete_todo(
     todo_id: Annotated[int, Field(description="The ID number of the task to remove")]
 ) -> Dict[str, Any]:
     """Remove a task from the list permanently."""
@@ -148,7 +130,7 @@ def delete_todo(
         return {"success": False, "error": f"Todo {todo_id} not found"}
 
     # Remove from storage and return the deleted item
-    deleted_todo = todo_store.todos.pop(todo_id)
+    deleted_todo = todo_store.remove(todo_id)
     return {"success": True, "deleted_todo": deleted_todo}
 
 
@@ -156,4 +138,10 @@ if __name__ == "__main__":
     # Start the MCP server
     # This will handle the MCP protocol over stdin/stdout
     # allowing AI assistants to discover and use our tools
-    mcp.run()
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:  # optional, installed with the "speedups" extra
+        mcp.run()
+    else:
+        # libuv-backed event loop: less overhead per stdio message
+        uvloop.run(mcp.run_async())
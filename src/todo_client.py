@@ -26,19 +26,226 @@ to various data sources and services.
 """
 import asyncio
 import os
+import re
+import ssl
 import sys
 import json
 import argparse
-from typing import Dict, Any, cast, Optional
+import functools
+import threading
+from typing import Callable, Dict, Any, cast, Optional
 from contextlib import AsyncExitStack
 from pathlib import Path
 
+import httpx
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 import anthropic
-from anthropic.types import TextBlock, ToolUseBlock
+from anthropic.types import Message, TextBlock, ToolUseBlock
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional, installed with the "speedups" extra
+    orjson = None
+
+# Upper bound on tool calls from one Claude turn running against the server at once
+MAX_CONCURRENT_TOOL_CALLS = 8
+
+# Words that end the chat session (matched case-insensitively)
+EXIT_WORDS = frozenset({"quit", "exit", "bye"})
+
+# Greeting shown once the server is connected
+WELCOME_BANNER = "\n".join((
+    "",
+    "Welcome! I can help you manage your todos.",
+    "Examples of what you can say:",
+    "- 'Add a todo to buy groceries'",
+    "- 'Show me all my todos'",
+    "- 'Mark todo 1 as complete'",
+    "- 'Delete the shopping todo'",
+    "",
+    "Type 'quit' to exit.",
+    "",
+))
+
+# Claude model used for every request
+MODEL = "claude-3-5-sonnet-20241022"
+
+# System prompt that enables multi-pass reasoning
+SYSTEM_PROMPT = """You are a helpful assistant that manages todos using MCP tools.
+
+You can use these tools to help users manage their todo lists. You may need to:
+- Call multiple tools to complete a request
+- Analyze results from one tool before calling another
+- Ask clarifying questions if a request is ambiguous
+- Provide thoughtful summaries of data
+
+Approach each request step by step:
+1. Understand what the user wants
+2. Determine which tools you need to use
+3. Execute tools and analyze their results
+4. Continue until you have a complete answer
+5. Provide a clear, helpful response to the user
+
+Be conversational and helpful in your responses."""
+
+# How often to check whether a submitted message batch has finished
+BATCH_POLL_SECONDS = 5
+
+# Extra parameter added to every tool with --think; Claude must justify each
+# call, which cuts down on unnecessary ones. Stripped before calling the server.
+TOOLCALL_REASON_SCHEMA = {
+    "type": "string",
+    "description": "Why you are calling this tool."
+}
+
+# Tools whose names start with these only read state, so their results can be
+# reused until a tool that changes state runs
+READ_ONLY_TOOL_PREFIXES = ("list", "get")
+
+# Servers exposing more tools than this are not sent to Claude schema by schema.
+# Claude instead gets search_tools/call_tool and looks up what it needs, which
+# keeps the prompt small as the tool registry grows.
+TOOL_SEARCH_THRESHOLD = 20
+
+# Meta-tools offered to Claude in place of the full list above the threshold
+TOOL_SEARCH_TOOLS = [
+    {
+        "name": "search_tools",
+        "description": (
+            "Search the available todo management tools by keyword. Returns the "
+            "best matching tools with their descriptions and parameter schemas. "
+            "Use this before call_tool to find the right tool and its arguments."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Keywords describing the action you need, e.g. 'create todo'"}
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "call_tool",
+        "description": "Call a tool found with search_tools, passing arguments that match its parameter schema.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Exact tool name returned by search_tools"},
+                "arguments": {"type": "object", "description": "Arguments for the tool"}
+            },
+            "required": ["name"]
+        }
+    },
+]
+
+
+@functools.cache
+def custom_http_client() -> Optional[httpx.AsyncClient]:
+    """HTTP client for a proxy or custom CA, or None to use the SDK default.
+    
+    Built once and shared. Resolved on first use rather than at import so
+    that settings in .env.local are picked up. Requests go through
+    HTTPS_PROXY when it is set. REQUESTS_CA_BUNDLE replaces the trusted
+    certificates, for TLS-intercepting proxies (ZScaler and the like)
+    whether they are configured with HTTPS_PROXY or sit transparently on
+    the network.
+    """
+    proxy_url = os.environ.get("HTTPS_PROXY") or os.environ.get("https_proxy")
+    ca_bundle = os.environ.get("REQUESTS_CA_BUNDLE")
+    if not proxy_url and not ca_bundle:
+        return None
+    verify = ssl.create_default_context(cafile=ca_bundle) if ca_bundle else True
+    return httpx.AsyncClient(proxy=proxy_url or None, verify=verify)
+
+
+def format_json(text: str) -> str:
+    """Pretty-print a JSON string for debug output.
+    
+    Text that isn't JSON (such as a tool error message) is returned as-is.
+    """
+    try:
+        if orjson is not None:
+            return orjson.dumps(orjson.loads(text), option=orjson.OPT_INDENT_2).decode()
+        return json.dumps(json.loads(text), indent=2)
+    except ValueError:
+        return text
+
+
+# Bytes read from redirected stdin past the end of the last line returned
+_stdin_buffer = bytearray()
+
+
+async def _read_redirected_line(prompt: str) -> str:
+    """Read a line from piped or redirected stdin on the event loop.
+    
+    The loop waits for stdin to become readable, so no thread is left
+    blocked holding stdin if the session ends at the prompt.
+    """
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    print(prompt, end="", flush=True)
+    while b"\n" not in _stdin_buffer:
+        readable = loop.create_future()
+        
+        def on_readable():
+            loop.remove_reader(fd)
+            readable.set_result(None)
+        
+        try:
+            loop.add_reader(fd, on_readable)
+        except OSError:
+            # Regular files can't be watched, but reading them never blocks
+            pass
+        else:
+            try:
+                await readable
+            finally:
+                loop.remove_reader(fd)
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        _stdin_buffer.extend(chunk)
+    if not _stdin_buffer:
+        raise EOFError
+    line, _, rest = bytes(_stdin_buffer).partition(b"\n")
+    _stdin_buffer[:] = rest
+    return line.rstrip(b"\r").decode(sys.stdin.encoding or "utf-8")
+
+
+async def read_input(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop.
+    
+    An interactive terminal keeps input() for its line editing, run on a
+    daemon thread so the loop keeps serving MCP and API traffic while the
+    user types. There input() reads through readline rather than the stdin
+    buffer, so a thread left waiting at exit doesn't hold up interpreter
+    shutdown. Anything else is read on the loop itself, except on Windows,
+    whose loops can't watch stdin.
+    """
+    interactive = sys.stdin.isatty() and sys.stdout.isatty()
+    if not interactive and sys.platform != "win32":
+        return await _read_redirected_line(prompt)
+    
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def deliver(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def reader():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(deliver, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(deliver, future.set_result, line)
+    
+    threading.Thread(target=reader, daemon=True).start()
+    return await future
+
 
 class TodoMCPClient:
     """MCP client for communicating with the todo server.
@@ -63,6 +270,11 @@ class TodoMCPClient:
         self.session = None
         self.exit_stack = AsyncExitStack()
         self.available_tools = []
+        self._tools_loaded = False
+        self._tools_lock = asyncio.Lock()
+        # Formatted tool description and the tool list it was built from
+        self._tools_description = ""
+        self._tools_description_source = None
         if server_path:
             self.server_path = server_path
         else:
@@ -75,15 +287,29 @@ class TodoMCPClient:
         1. Launch the server as a subprocess
         2. Establish stdio communication channels
         3. Initialize the MCP session
-        4. Discover available tools
+        
+        Tool discovery is deferred to ensure_tools(), so the chat prompt
+        appears without waiting for the server's tool list.
         
         This pattern allows any application to become MCP-enabled
         without modifying its core code.
+        
+        The session is long-lived: calling connect() again while connected
+        is a no-op, so the server subprocess and handshake are paid once.
         """
-        # Configure how to launch the MCP server
+        if self.session is not None:
+            return
+        
+        # Configure how to launch the MCP server. By default the server runs
+        # on this interpreter directly, which skips the extra uv process and
+        # its dependency resolution; set TODO_SERVER_USE_UV=1 to go through uv
+        if os.getenv("TODO_SERVER_USE_UV"):
+            command, args = "uv", ["run", self.server_path]
+        else:
+            command, args = sys.executable, [self.server_path]
         server_params = StdioServerParameters(
-            command="uv",  # Using uv to run the Python script
-            args=["run", self.server_path],
+            command=command,
+            args=args,
             env=None
         )
         
@@ -100,11 +326,23 @@ class TodoMCPClient:
         
         # Initialize the connection
         await self.session.initialize()
+        print("Connected to Todo Server.")
+    
+    async def ensure_tools(self):
+        """Discover the server's tools the first time they are needed.
         
-        # Discover available tools - this is key for AI to know what it can do
-        response = await self.session.list_tools()
-        self.available_tools = response.tools
-        print(f"Connected to Todo Server. Available tools: {[tool.name for tool in self.available_tools]}")
+        Knowing the available tools is key for AI to know what it can do.
+        Concurrent callers share a single list_tools request.
+        """
+        async with self._tools_lock:
+            if self._tools_loaded:
+                return
+            if self.session is None:
+                raise RuntimeError("MCP session not initialized. Call connect() first.")
+            response = await self.session.list_tools()
+            self.available_tools = response.tools
+            self._tools_loaded = True
+            print(f"Available tools: {[tool.name for tool in self.available_tools]}")
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """Call a tool on the MCP server.
@@ -139,13 +377,20 @@ class TodoMCPClient:
         Returns:
             Formatted string describing all available tools and their parameters
         """
-        tools_desc = "Available todo management tools:\n"
+        # Reuse the last description until the tool list is replaced
+        if self._tools_description_source is self.available_tools:
+            return self._tools_description
+        
+        parts = ["Available todo management tools:\n"]
         for tool in self.available_tools:
-            tools_desc += f"- {tool.name}: {tool.description}\n"
+            parts.append(f"- {tool.name}: {tool.description}\n")
             # Include parameter information to help AI understand usage
             if tool.inputSchema and 'properties' in tool.inputSchema:
-                tools_desc += f"  Parameters: {list(tool.inputSchema['properties'].keys())}\n"
-        return tools_desc
+                parts.append(f"  Parameters: {', '.join(tool.inputSchema['properties'])}\n")
+        
+        self._tools_description = "".join(parts)
+        self._tools_description_source = self.available_tools
+        return self._tools_description
 
 
 class TodoChatClient:
@@ -170,30 +415,51 @@ class TodoChatClient:
     between AI services and application logic.
     """
     
-    def __init__(self, anthropic_api_key: str, server_path: Optional[str] = None, debug: bool = False):
+    def __init__(
+        self,
+        anthropic_api_key: str,
+        server_path: Optional[str] = None,
+        debug: bool = False,
+        think: bool = False,
+        max_iterations: int = 10
+    ):
         """Initialize the chat client.
         
         Args:
             anthropic_api_key: API key for Claude
             server_path: Optional path to the MCP server
             debug: Enable debug logging for tool calls and API requests
+            think: Require Claude to give a toolcall_reason with every tool call
+            max_iterations: Most Claude calls to make for one user message
         """
         self.mcp_client = TodoMCPClient(server_path=server_path)
         
-        # Configure Anthropic client with proxy support if needed
+        # Configure Anthropic client with proxy and CA support if needed
         client_kwargs = {"api_key": anthropic_api_key}
-        proxy_url = os.getenv("HTTPS_PROXY") or os.getenv("https_proxy")
-        
-        if proxy_url:
-            import httpx
-            client_kwargs["http_client"] = httpx.Client(
-                proxy=proxy_url,
-                verify=False  # Disable SSL verification for corporate proxies
-            )
+        http_client = custom_http_client()
+        if http_client is not None:
+            client_kwargs["http_client"] = http_client
         
-        self.anthropic_client = anthropic.Anthropic(**client_kwargs)
+        # Async client so waiting on Claude doesn't block the event loop
+        self.anthropic_client = anthropic.AsyncAnthropic(**client_kwargs)
         self.conversation_history = []
         self.debug = debug
+        self.think = think
+        self.max_iterations = max_iterations
+        # Caps concurrent tool calls so a large turn can't flood the MCP server
+        self.tool_call_limit = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+        # Anthropic-format tools and the MCP tool list they were built from
+        self._anthropic_tools: list = []
+        self._anthropic_tools_source = None
+        # Full tool schemas and their search terms, used when there are too
+        # many tools to send them all (see TOOL_SEARCH_THRESHOLD)
+        self._tool_search_enabled = False
+        self._tool_index: list = []
+        # Results of read-only tool calls keyed by (tool name, canonical args).
+        # The generation counter is bumped by every write so a read that raced
+        # with a write doesn't store a stale result.
+        self._tool_cache: Dict[tuple, str] = {}
+        self._tool_cache_generation = 0
         
         # Determine server type for emoji display
         if server_path and "bad_todo_server" in server_path:
@@ -210,40 +476,70 @@ class TodoChatClient:
         
         await self.mcp_client.connect()
         
-        print("\nWelcome! I can help you manage your todos.")
-        print("Examples of what you can say:")
-        print("- 'Add a todo to buy groceries'")
-        print("- 'Show me all my todos'")
-        print("- 'Mark todo 1 as complete'")
-        print("- 'Delete the shopping todo'")
-        print("\nType 'quit' to exit.\n")
+        print(WELCOME_BANNER)
         
         await self.chat_loop()
     
+    async def run_batch(self, batch_file: str):
+        """Run every prompt in a file (one per line) as a message batch.
+        
+        Args:
+            batch_file: Path to a text file of prompts; blank lines are skipped
+        """
+        prompts = [line.strip() for line in Path(batch_file).read_text().splitlines() if line.strip()]
+        print(f"Connecting to Todo Server to run {len(prompts)} batched prompts...")
+        
+        await self.mcp_client.connect()
+        
+        responses = await self.process_batch(prompts)
+        for prompt, response in zip(prompts, responses):
+            print(f"{self.server_emoji} You: {prompt}")
+            print(f"{self.server_emoji} Claude: {response}\n")
+    
     async def chat_loop(self):
         """Main chat interaction loop"""
         while True:
             try:
-                user_input = input(f"{self.server_emoji} You: ").strip()
+                user_input = (await read_input(f"{self.server_emoji} You: ")).strip()
                 
-                if user_input.lower() in ['quit', 'exit', 'bye']:
+                if user_input.lower() in EXIT_WORDS:
                     print(f"{self.server_emoji} Claude: Goodbye! Your todos are saved.")
                     break
                 
                 if not user_input:
                     continue
                 
-                # Process the user input with Claude
-                response = await self.process_with_llm(user_input)
-                print(f"{self.server_emoji} Claude: {response}")
+                # Process the user input with Claude, printing its text as it
+                # streams in rather than after the whole turn has finished
+                streamed = []
+                
+                def show(text: str):
+                    if not streamed:
+                        print(f"{self.server_emoji} Claude: ", end="")
+                    streamed.append(text)
+                    print(text, end="", flush=True)
+                
+                response = await self.process_with_llm(user_input, on_text=show)
+                if streamed:
+                    print()
+                # Errors and fallback messages never went through the stream
+                if response not in "".join(streamed):
+                    print(f"{self.server_emoji} Claude: {response}")
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, asyncio.CancelledError, EOFError):
+                # Ctrl+C arrives as a cancellation while awaiting the prompt;
+                # EOF (Ctrl+D or piped input running out) ends the session too
                 print(f"\n{self.server_emoji} Claude: Goodbye!")
                 break
             except Exception as e:
                 print(f"Error: {e}")
     
-    async def process_with_llm(self, user_input: str) -> str:
+    async def process_with_llm(
+        self,
+        user_input: str,
+        on_text: Optional[Callable[[str], None]] = None,
+        first_response: Optional[Message] = None
+    ) -> str:
         """Process user input using Claude with multi-pass tool execution.
         
         This implements a multi-pass pattern where:
@@ -254,59 +550,57 @@ class TodoChatClient:
         
         Args:
             user_input: Natural language message from the user
+            on_text: Optional callback receiving Claude's text as it streams in
+            first_response: Claude's already-generated reply to user_input
+                (e.g. from a message batch); the loop continues from it
+                instead of making the first API call
             
         Returns:
             Natural language response with complete results
         """
-        # System prompt that enables multi-pass reasoning
-        system_prompt = """You are a helpful assistant that manages todos using MCP tools.
-
-You can use these tools to help users manage their todo lists. You may need to:
-- Call multiple tools to complete a request
-- Analyze results from one tool before calling another
-- Ask clarifying questions if a request is ambiguous
-- Provide thoughtful summaries of data
-
-Approach each request step by step:
-1. Understand what the user wants
-2. Determine which tools you need to use
-3. Execute tools and analyze their results
-4. Continue until you have a complete answer
-5. Provide a clear, helpful response to the user
-
-Be conversational and helpful in your responses."""
-        
-        # Convert MCP tools to Anthropic tool format
-        tools = self.convert_to_anthropic_tools()
+        # Make sure Claude will be told about the server's tools
+        await self.mcp_client.ensure_tools()
         
         # Initialize conversation with user input
         messages = [{"role": "user", "content": user_input}]
         
-        # Multi-pass loop - continue until Claude provides final answer
-        max_iterations = 10  # Prevent infinite loops
+        # Tool calls from the previous pass, to spot Claude retrying the exact
+        # same calls without making progress
+        previous_calls = None
         
-        for iteration in range(max_iterations):
+        # Multi-pass loop - continue until Claude provides final answer
+        for iteration in range(self.max_iterations):  # Prevent infinite loops
             try:
-                # Debug logging for LLM API calls
-                if self.debug:
-                    print(f"🤖 LLM API Call #{iteration + 1}: claude-3-5-sonnet-20241022")
-                    print(f"🤖 Messages count: {len(messages)}")
-                    print(f"🤖 Tools available: {len(tools)}")
+                if first_response is not None:
+                    response, first_response = first_response, None
+                else:
+                    request = self.build_request(messages)
+                    
+                    # Debug logging for LLM API calls
+                    if self.debug:
+                        print(f"🤖 LLM API Call #{iteration + 1}: {MODEL}")
+                        print(f"🤖 Messages count: {len(messages)}")
+                        print(f"🤖 Tools available: {len(request['tools'])}")
+                    
+                    # Get Claude's response with tools, streaming text to the
+                    # caller while the rest of the message is still being generated
+                    async with self.anthropic_client.messages.stream(**request) as stream:
+                        if on_text is not None:
+                            async for text in stream.text_stream:
+                                on_text(text)
+                        response = await stream.get_final_message()
                 
-                # Get Claude's response with tools
-                response = self.anthropic_client.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=1000,
-                    temperature=0,
-                    system=system_prompt,
-                    messages=messages,
-                    tools=tools
-                )
+                # Split the response into tool calls and text in a single pass
+                tool_calls = []
+                text_blocks = []
+                for block in response.content:
+                    if block.type == "tool_use":
+                        tool_calls.append(block)
+                    elif block.type == "text":
+                        text_blocks.append(block)
                 
                 # Debug logging for LLM responses
                 if self.debug:
-                    tool_calls = [block for block in response.content if block.type == "tool_use"]
-                    text_blocks = [block for block in response.content if block.type == "text"]
                     print(f"🤖 LLM Response: {len(tool_calls)} tool calls, {len(text_blocks)} text blocks")
                     if text_blocks and not tool_calls:
                         print(f"🤖 Final Response: {text_blocks[0].text[:100]}{'...' if len(text_blocks[0].text) > 100 else ''}")
@@ -314,63 +608,48 @@ Be conversational and helpful in your responses."""
                 # Add assistant message to conversation
                 messages.append({"role": "assistant", "content": response.content})
                 
-                # Check if Claude made any tool calls
-                tool_calls = [block for block in response.content if block.type == "tool_use"]
-                
                 if not tool_calls:
                     # No tool calls means Claude has final answer
-                    # Extract text from response
-                    text_blocks = [block for block in response.content if block.type == "text"]
                     if text_blocks:
                         return text_blocks[0].text
                     else:
                         return "I completed the task."
                 
-                # Execute each tool call
-                for tool_call in tool_calls:
-                    tool_name = tool_call.name
-                    tool_args = tool_call.input
-                    tool_id = tool_call.id
-                    
-                    try:
-                        # Debug logging for tool calls
-                        if self.debug:
-                            print(f"🔧 MCP Tool Call: {tool_name}({json.dumps(tool_args, indent=2)})")
-                        
-                        # Execute the MCP tool
-                        result = await self.mcp_client.call_tool(tool_name, tool_args)
-                        
-                        # Parse the result
-                        if hasattr(result, 'content'):
-                            result_data = json.loads(result.content[0].text) if result.content else {}
-                        else:
-                            result_data = {}
-                        
-                        # Debug logging for tool results
-                        if self.debug:
-                            print(f"🔧 MCP Tool Result: {json.dumps(result_data, indent=2)}")
-                        
-                        # Add tool result to conversation
-                        messages.append({
-                            "role": "user",
-                            "content": [{
-                                "type": "tool_result",
-                                "tool_use_id": tool_id,
-                                "content": json.dumps(result_data)
-                            }]
-                        })
-                        
-                    except Exception as e:
-                        # Add error to conversation so Claude can handle it
-                        messages.append({
-                            "role": "user",
-                            "content": [{
-                                "type": "tool_result",
-                                "tool_use_id": tool_id,
-                                "content": f"Error: {str(e)}",
-                                "is_error": True
-                            }]
-                        })
+                # Identical reads, or calls that failed last pass, would just
+                # get the same results again, so stop rather than spend another
+                # round trip. Repeated writes can be intended (two identical
+                # todos), so those are left to the iteration cap.
+                # A --think reason may be reworded between retries, so it is ignored.
+                calls = [
+                    (tool_call.name, json.dumps(
+                        {key: value for key, value in tool_call.input.items() if key != "toolcall_reason"},
+                        sort_keys=True
+                    ))
+                    for tool_call in tool_calls
+                ]
+                if calls == previous_calls:
+                    return "I seem to be stuck repeating the same tool calls. Please try rephrasing your request."
+                
+                # Execute the tool calls concurrently - calls made in the same
+                # turn are independent, so the turn takes as long as the slowest
+                # call rather than the sum of all of them
+                tool_results = await asyncio.gather(
+                    *(self.execute_tool_call(tool_call) for tool_call in tool_calls)
+                )
+                
+                # Only a pass that read or failed counts as a possible repeat
+                no_progress = all(
+                    self.is_read_only(tool_call) or result.get("is_error")
+                    for tool_call, result in zip(tool_calls, tool_results)
+                )
+                previous_calls = calls if no_progress else None
+                
+                # Return every result to Claude in a single user turn
+                messages.append({"role": "user", "content": list(tool_results)})
+                
+                # Start the next pass's streamed text on a fresh line
+                if on_text is not None and text_blocks:
+                    on_text("\n")
                 
             except anthropic.APIConnectionError as e:
                 # Check for SSL certificate errors
@@ -386,6 +665,7 @@ Be conversational and helpful in your responses."""
                         "Possible solutions:\n"
                         "• Run: pip install --upgrade certifi\n"
                         "• Check with your IT team about proxy certificates\n"
+                        "• Set REQUESTS_CA_BUNDLE to your proxy's CA certificate file\n"
                         "• Set proxy environment variables if behind a corporate firewall"
                     )
                 else:
@@ -406,27 +686,264 @@ Be conversational and helpful in your responses."""
         
         return "I need more time to complete this request. Please try breaking it into smaller steps."
     
+    def build_request(self, messages: list) -> Dict[str, Any]:
+        """Build the parameters for a Claude request over the given messages.
+        
+        Shared by interactive turns and batch submissions so both send the
+        same model, system prompt and tools.
+        """
+        return {
+            "model": MODEL,
+            "max_tokens": 1000,
+            "temperature": 0,
+            # Mark the system prompt as cacheable - it is identical on every
+            # request, so Claude can reuse it instead of reprocessing it
+            "system": [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+            "messages": messages,
+            "tools": self.convert_to_anthropic_tools()
+        }
+    
+    async def process_batch(self, inputs: list[str]) -> list[str]:
+        """Process many independent requests through the Message Batches API.
+        
+        The first Claude call for every input is submitted as one batch,
+        which costs less than individual requests but may take minutes to
+        finish. Any tool calls Claude asks for are then run locally against
+        the MCP server, one input at a time and in order, continuing each
+        conversation with regular requests.
+        
+        Args:
+            inputs: Natural language messages, one per request
+            
+        Returns:
+            Claude's final response for each input, in the same order
+        """
+        await self.mcp_client.ensure_tools()
+        batch = await self.anthropic_client.messages.batches.create(requests=[
+            {"custom_id": f"request-{index}", "params": self.build_request([{"role": "user", "content": text}])}
+            for index, text in enumerate(inputs)
+        ])
+        while batch.processing_status != "ended":
+            if self.debug:
+                print(f"🤖 Batch {batch.id}: {batch.processing_status}")
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            batch = await self.anthropic_client.messages.batches.retrieve(batch.id)
+        
+        first_responses = {}
+        async for entry in await self.anthropic_client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                first_responses[entry.custom_id] = entry.result.message
+        
+        # Requests that errored or expired in the batch fall back to a
+        # regular call inside process_with_llm
+        return [
+            await self.process_with_llm(text, first_response=first_responses.get(f"request-{index}"))
+            for index, text in enumerate(inputs)
+        ]
+    
+    def is_read_only(self, tool_call: ToolUseBlock) -> bool:
+        """Whether a tool call only reads state on the server.
+        
+        Looks through call_tool to the tool it wraps; search_tools never
+        reaches the server.
+        """
+        tool_name = tool_call.name
+        if self._tool_search_enabled:
+            if tool_name == "search_tools":
+                return True
+            if tool_name == "call_tool":
+                tool_name = tool_call.input.get("name", "")
+        return tool_name.startswith(READ_ONLY_TOOL_PREFIXES)
+    
+    async def execute_tool_call(self, tool_call: ToolUseBlock) -> Dict[str, Any]:
+        """Execute one of Claude's tool calls against the MCP server.
+        
+        Args:
+            tool_call: A tool_use block from Claude's response
+            
+        Returns:
+            A tool_result content block for the next user message. Failures
+            are reported with is_error set so Claude can handle them.
+        """
+        tool_name = tool_call.name
+        tool_args = tool_call.input
+        tool_id = tool_call.id
+        
+        try:
+            # The reason only exists for Claude's benefit - keep it away from
+            # the server (copying so the assistant message stays intact)
+            if self.think:
+                tool_args = dict(tool_args)
+                reason = tool_args.pop("toolcall_reason", None)
+                if self.debug and reason:
+                    print(f"🔧 Tool Call Reason: {reason}")
+            
+            # Meta-tools used when the full tool list is too large to send
+            if self._tool_search_enabled:
+                if tool_name == "search_tools":
+                    return {
+                        "type": "tool_result",
+                        "tool_use_id": tool_id,
+                        "content": json.dumps(self.search_tools(tool_args.get("query", "")))
+                    }
+                if tool_name == "call_tool":
+                    tool_name = tool_args["name"]
+                    tool_args = tool_args.get("arguments") or {}
+            
+            # Reuse an earlier result for an identical read-only call
+            read_only = tool_name.startswith(READ_ONLY_TOOL_PREFIXES)
+            cache_key = (tool_name, json.dumps(tool_args, sort_keys=True))
+            if read_only and cache_key in self._tool_cache:
+                if self.debug:
+                    print(f"🔧 MCP Tool Cache Hit: {tool_name}({cache_key[1]})")
+                return {
+                    "type": "tool_result",
+                    "tool_use_id": tool_id,
+                    "content": self._tool_cache[cache_key]
+                }
+            
+            # Debug logging for tool calls, reusing the arguments already
+            # serialized for the cache key
+            if self.debug:
+                print(f"🔧 MCP Tool Call: {tool_name}({format_json(cache_key[1])})")
+            
+            # Invalidate before a write is dispatched too, so reads running
+            # alongside it in the same turn neither hit nor fill the cache
+            if not read_only:
+                self._tool_cache.clear()
+                self._tool_cache_generation += 1
+
+            # Execute the MCP tool, bounding how many run at once
+            generation = self._tool_cache_generation
+            try:
+                async with self.tool_call_limit:
+                    result = await self.mcp_client.call_tool(tool_name, tool_args)
+            finally:
+                if not read_only:
+                    # Any write, even a failed one, may change what reads return
+                    self._tool_cache.clear()
+                    self._tool_cache_generation += 1
+            
+            # The server already answers with JSON text, so pass it to Claude
+            # as-is instead of decoding and re-encoding it
+            content = result.content[0].text if result.content else "{}"
+            
+            # Debug logging for tool results - only formatted when shown
+            if self.debug:
+                print(f"🔧 MCP Tool Result: {format_json(content)}")
+            
+            if result.isError:
+                return {
+                    "type": "tool_result",
+                    "tool_use_id": tool_id,
+                    "content": content,
+                    "is_error": True
+                }
+            
+            if read_only and generation == self._tool_cache_generation:
+                self._tool_cache[cache_key] = content
+            
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_id,
+                "content": content
+            }
+            
+        except Exception as e:
+            # Report the error so Claude can handle it
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_id,
+                "content": f"Error: {str(e)}",
+                "is_error": True
+            }
+    
     def convert_to_anthropic_tools(self) -> list:
-        """Convert MCP tools to Anthropic's tool format."""
+        """Convert MCP tools to Anthropic's tool format.
+        
+        The converted list is cached and only rebuilt when the MCP client's
+        tool list is replaced, so repeated turns reuse the same schemas.
+        """
+        available_tools = self.mcp_client.available_tools
+        if self._anthropic_tools_source is available_tools:
+            return self._anthropic_tools
+        
         anthropic_tools = []
         
-        for tool in self.mcp_client.available_tools:
-            # Parse parameter schema from the tool object
-            params = tool.inputSchema if hasattr(tool, 'inputSchema') else {}
+        for tool in available_tools:
+            # Parse parameter schema from the tool object - inputSchema and
+            # description are always present on MCP Tool models, though
+            # description may be None
+            params = tool.inputSchema or {}
             
             anthropic_tool = {
                 "name": tool.name,
-                "description": tool.description if hasattr(tool, 'description') else '',
+                "description": tool.description or '',
                 "input_schema": {
                     "type": "object",
-                    "properties": params.get('properties', {}) if isinstance(params, dict) else {},
-                    "required": params.get('required', []) if isinstance(params, dict) else []
+                    "properties": params.get('properties', {}),
+                    "required": params.get('required', [])
                 }
             }
             anthropic_tools.append(anthropic_tool)
         
+        # Large registries are searched on demand instead of sent in full
+        self._tool_search_enabled = len(anthropic_tools) > TOOL_SEARCH_THRESHOLD
+        if self._tool_search_enabled:
+            self._tool_index = [
+                (tool, self._tool_terms(tool)) for tool in anthropic_tools
+            ]
+            anthropic_tools = [dict(tool) for tool in TOOL_SEARCH_TOOLS]
+        
+        # With --think, each tool first asks Claude why it is being called.
+        # New schema dicts are built so the MCP tool definitions are untouched.
+        if self.think:
+            for tool in anthropic_tools:
+                schema = tool["input_schema"]
+                tool["input_schema"] = {
+                    **schema,
+                    "properties": {"toolcall_reason": TOOLCALL_REASON_SCHEMA, **schema["properties"]},
+                    "required": ["toolcall_reason", *schema["required"]]
+                }
+        
+        # A cache breakpoint on the last tool lets Claude reuse the whole tool
+        # schema prefix across calls
+        if anthropic_tools:
+            anthropic_tools[-1]["cache_control"] = {"type": "ephemeral"}
+        
+        self._anthropic_tools = anthropic_tools
+        self._anthropic_tools_source = available_tools
         return anthropic_tools
     
+    @staticmethod
+    def _tool_terms(tool: Dict[str, Any]) -> set:
+        """Search terms for a tool: its name, first sentence and parameter names."""
+        summary = tool["description"].split(".", 1)[0]
+        params = " ".join(tool["input_schema"]["properties"])
+        return set(re.findall(r"[a-z0-9]+", f"{tool['name']} {summary} {params}".lower()))
+    
+    def search_tools(self, query: str, limit: int = 5) -> list:
+        """Find the tools that best match a keyword query.
+        
+        Tools are ranked by how many query words appear in their name, first
+        description sentence or parameter names.
+        
+        Args:
+            query: Keywords describing the action Claude wants to take
+            limit: Maximum number of tools to return
+            
+        Returns:
+            Matching tools in Anthropic's tool format, best match first
+        """
+        query_terms = set(re.findall(r"[a-z0-9]+", query.lower()))
+        scored = [
+            (len(query_terms & terms), tool) for tool, terms in self._tool_index
+        ]
+        matches = sorted(
+            (item for item in scored if item[0]), key=lambda item: item[0], reverse=True
+        )
+        return [tool for _, tool in matches[:limit]]
+    
     async def cleanup(self):
         """Clean up resources"""
         await self.mcp_client.close()
@@ -462,6 +979,16 @@ async def main():
         action="store_true",
         help="Enable debug logging for MCP tool calls and LLM API calls"
     )
+    parser.add_argument(
+        "--think",
+        action="store_true",
+        help="Make Claude state a reason for every tool call, reducing unnecessary calls"
+    )
+    parser.add_argument(
+        "--batch-file",
+        type=str,
+        help="Run the prompts in this file (one per line) through the Message Batches API instead of the chat REPL"
+    )
     
     # Add mutually exclusive group for server selection
     server_group = parser.add_mutually_exclusive_group()
@@ -502,13 +1029,27 @@ async def main():
         sys.exit(1)
     
     # Create and run the client with proper cleanup
-    client = TodoChatClient(api_key, server_path=server_path, debug=args.debug)
+    client = TodoChatClient(api_key, server_path=server_path, debug=args.debug, think=args.think)
     try:
-        await client.start()
+        if args.batch_file:
+            await client.run_batch(args.batch_file)
+        else:
+            await client.start()
     finally:
         # Always clean up resources, even if errors occur
         await client.cleanup()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:  # optional, installed with the "speedups" extra
+        run = asyncio.run
+    else:
+        # libuv-backed event loop for the stdio and HTTPS traffic
+        run = uvloop.run
+    try:
+        run(main())
+    except KeyboardInterrupt:
+        # The chat loop has already said goodbye
+        pass
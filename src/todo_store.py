@@ -0,0 +1,106 @@
+"""
+Shared in-memory todo storage for the tutorial MCP servers.
+
+Both good_todo_server.py and bad_todo_server.py keep their todos in a
+TodoStore. The store only deals in ids and completion status, so each
+server stays free to name the fields of its todo dicts however it likes
+(the bad server's cryptic "co"/"pr" keys included).
+
+It also holds the helpers both servers use when building responses:
+now_iso() for timestamps and tool_serializer for FastMCP.
+
+Each server process creates its own instance; nothing is shared at runtime.
+"""
+from typing import Callable, Dict, Any, List, Optional
+import itertools
+import time
+
+try:
+    import orjson
+except ImportError:  # optional, installed with the "speedups" extra
+    orjson = None
+
+
+# Timestamps are cached for a millisecond so bursts of tool calls share one
+# formatted string, and are built with a single %-format rather than a datetime
+_ts_cache = [0.0, ""]
+
+def now_iso() -> str:
+    t = time.time()
+    if not 0 <= t - _ts_cache[0] < 0.001:
+        secs = int(t)
+        lt = time.localtime(secs)
+        _ts_cache[0] = t
+        _ts_cache[1] = "%04d-%02d-%02dT%02d:%02d:%02d.%06d" % (
+            lt.tm_year, lt.tm_mon, lt.tm_mday,
+            lt.tm_hour, lt.tm_min, lt.tm_sec,
+            int((t - secs) * 1_000_000),
+        )
+    return _ts_cache[1]
+
+
+def serialize_result(data: Any) -> str:
+    # Compact orjson encoding for tool results; list responses grow with
+    # the store, so encoding is the main per-call cost for large lists
+    return orjson.dumps(data, default=str).decode()
+
+# Passed to FastMCP; None keeps its default JSON encoding when orjson is missing
+tool_serializer: Optional[Callable[[Any], str]] = serialize_result if orjson is not None else None
+
+
+# In-memory storage for todos - in production, this would be a database
+# This demonstrates that MCP servers can work with any data storage backend
+class TodoStore:
+    __slots__ = ("todos", "_id_gen", "_completed_ids", "_pending_ids", "_ids_by_status", "_filter_cache")
+
+    def __init__(self):
+        self.todos: Dict[int, Dict[str, Any]] = {}
+        # itertools.count advances in C, so ids stay unique even if tool
+        # handlers ever interleave
+        self._id_gen = itertools.count(1)
+        # Ids grouped by completion status, kept in sync on every change so
+        # filtered listings never need to scan the whole store
+        self._completed_ids: set[int] = set()
+        self._pending_ids: set[int] = set()
+        self._ids_by_status = {"completed": self._completed_ids, "pending": self._pending_ids}
+        # Filtered listings by status, dropped whenever membership changes.
+        # The lists hold the live todo dicts, so in-place edits to a todo's
+        # fields show up without invalidating anything.
+        self._filter_cache: Dict[str, List[Dict[str, Any]]] = {}
+
+    def get_next_id(self) -> int:
+        return next(self._id_gen)
+
+    def add(self, todo_id: int, todo: Dict[str, Any]) -> None:
+        # New todos always start out pending
+        self.todos[todo_id] = todo
+        self._pending_ids.add(todo_id)
+        self._filter_cache.clear()
+
+    def set_completed(self, todo_id: int, completed: bool) -> None:
+        if completed:
+            self._pending_ids.discard(todo_id)
+            self._completed_ids.add(todo_id)
+        else:
+            self._completed_ids.discard(todo_id)
+            self._pending_ids.add(todo_id)
+        self._filter_cache.clear()
+
+    def remove(self, todo_id: int) -> Dict[str, Any]:
+        self._completed_ids.discard(todo_id)
+        self._pending_ids.discard(todo_id)
+        self._filter_cache.clear()
+        return self.todos.pop(todo_id)
+
+    def filter(self, status: str) -> List[Dict[str, Any]]:
+        cached = self._filter_cache.get(status)
+        if cached is not None:
+            return cached
+        if status == "all":
+            todos = list(self.todos.values())
+        else:
+            ids = self._ids_by_status[status]
+            # Ids are handed out in increasing order, so sorting keeps creation order
+            todos = [self.todos[todo_id] for todo_id in sorted(ids)]
+        self._filter_cache[status] = todos
+        return todos